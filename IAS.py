@@ -1,19 +1,66 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils import get_column_letter
-from openpyxl.chart import LineChart, Reference
+from copy import copy
+from dataclasses import dataclass
 from io import BytesIO
-from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+
+# openpyxl and reportlab are imported inside the report generators so that
+# Streamlit reruns don't pay their import cost until a report is requested
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; fall back to plain Python when it isn't installed
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# DCF arithmetic kernel, JIT-compiled when Numba is available
+@njit(cache=True, fastmath=True)
+def _dcf_core(tax_rate, long_term_growth_rate, wacc, ebit, da, capex, changes_in_nwc):
+    """
+    Compute tax on EBIT, FCF, discount factors, present values, terminal value and enterprise value.
+    """
+    tax_on_ebit = np.empty(5)
+    fcf = np.empty(5)
+    discount_factors = np.empty(5)
+    present_values = np.empty(5)
+    period_discount = 1.0 / (1.0 + wacc)
+    discount_factor = 1.0
+    sum_present_values = 0.0
+    for i in range(5):
+        tax_on_ebit[i] = ebit[i] * -tax_rate
+        fcf[i] = ebit[i] + tax_on_ebit[i] + da[i] + capex[i] + changes_in_nwc[i]
+        discount_factor *= period_discount
+        discount_factors[i] = discount_factor
+        present_values[i] = fcf[i] * discount_factors[i]
+        sum_present_values += present_values[i]
+    terminal_value = fcf[4] * (1.0 + long_term_growth_rate) / (wacc - long_term_growth_rate)
+    present_terminal_value = terminal_value * discount_factors[4]
+    enterprise_value = sum_present_values + present_terminal_value
+    return (tax_on_ebit, fcf, discount_factors, present_values,
+            terminal_value, present_terminal_value, enterprise_value)
+
+# DCF results, with the per-period series kept as NumPy arrays
+@dataclass(slots=True)
+class DCFResult:
+    tax_on_ebit: np.ndarray
+    fcf: np.ndarray
+    discount_factors: np.ndarray
+    present_values: np.ndarray
+    terminal_value: float
+    present_terminal_value: float
+    enterprise_value: float
+    equity_value: float
+    intrinsic_value_per_share: float
+    market_cap: float
+    intrinsic_value_premium: float
+    intrinsic_value_premium_percentage: float
 
 # Function to calculate DCF
+@st.cache_data(show_spinner=False)
 def calculate_dcf(user_inputs):
     """
     Calculate DCF based on provided inputs.
@@ -23,34 +70,18 @@ def calculate_dcf(user_inputs):
     wacc = user_inputs["wacc"]
     share_price = user_inputs["share_price"]
     shares_outstanding = user_inputs["shares_outstanding"]
-    ebit = user_inputs["ebit"]
-    da = user_inputs["da"]
-    capex = user_inputs["capex"]
-    changes_in_nwc = user_inputs["changes_in_nwc"]
+    ebit = np.asarray(user_inputs["ebit"], dtype=np.float64)
+    da = np.asarray(user_inputs["da"], dtype=np.float64)
+    capex = np.asarray(user_inputs["capex"], dtype=np.float64)
+    changes_in_nwc = np.asarray(user_inputs["changes_in_nwc"], dtype=np.float64)
     cash = user_inputs["cash"]
     debt = user_inputs["debt"]
 
-    # Calculate Free Cash Flow (FCF) for each period
-    fcf = []
-    for i in range(5):
-        tax_on_ebit = ebit[i] * tax_rate * -1
-        fcf.append(ebit[i] + tax_on_ebit + da[i] + capex[i] + changes_in_nwc[i])
-
-    # Calculate Terminal Value
-    terminal_value = fcf[-1] * (1 + long_term_growth_rate) / (wacc - long_term_growth_rate)
-
-    # Discount Cash Flows
-    present_values = []
-    for i in range(5):
-        discount_factor = 1 / (1 + wacc) ** (i + 1)
-        present_values.append(fcf[i] * discount_factor)
-
-    # Discount Terminal Value
-    discount_factor_terminal = 1 / (1 + wacc) ** 5
-    present_terminal_value = terminal_value * discount_factor_terminal
-
-    # Calculate Enterprise Value
-    enterprise_value = sum(present_values) + present_terminal_value
+    # Calculate FCF, Terminal Value and discounted values
+    (tax_on_ebit, fcf, discount_factors, present_values,
+     terminal_value, present_terminal_value, enterprise_value) = _dcf_core(
+        float(tax_rate), float(long_term_growth_rate), float(wacc), ebit, da, capex, changes_in_nwc
+    )
 
     # Calculate Equity Value
     equity_value = enterprise_value + cash - debt
@@ -65,176 +96,209 @@ def calculate_dcf(user_inputs):
     intrinsic_value_premium = equity_value - market_cap
     intrinsic_value_premium_percentage = intrinsic_value_premium / market_cap
 
-    return {
-        "fcf": fcf,
-        "terminal_value": terminal_value,
-        "present_values": present_values,
-        "present_terminal_value": present_terminal_value,
-        "enterprise_value": enterprise_value,
-        "equity_value": equity_value,
-        "intrinsic_value_per_share": intrinsic_value_per_share,
-        "market_cap": market_cap,
-        "intrinsic_value_premium": intrinsic_value_premium,
-        "intrinsic_value_premium_percentage": intrinsic_value_premium_percentage,
-    }
+    return DCFResult(
+        tax_on_ebit=tax_on_ebit,
+        fcf=fcf,
+        discount_factors=discount_factors,
+        present_values=present_values,
+        terminal_value=float(terminal_value),
+        present_terminal_value=float(present_terminal_value),
+        enterprise_value=float(enterprise_value),
+        equity_value=equity_value,
+        intrinsic_value_per_share=intrinsic_value_per_share,
+        market_cap=market_cap,
+        intrinsic_value_premium=intrinsic_value_premium,
+        intrinsic_value_premium_percentage=intrinsic_value_premium_percentage,
+    )
 
 # Function to apply professional formatting to the spreadsheet
-def apply_formatting(ws):
+def apply_formatting(wb, ws):
     """
-    Apply professional formatting to the worksheet.
+    Set column widths and register the named cell styles used by the worksheet.
     """
-    # Set column widths
-    for col in range(1, 13):
-        ws.column_dimensions[get_column_letter(col)].width = 15
-
-    # Set header styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-    header_border = Border(bottom=Side(border_style="thin"))
-    for row in ws.iter_rows(min_row=1, max_row=4, max_col=12):
-        for cell in row:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = header_border
-            cell.alignment = Alignment(horizontal="center")
-
-    # Set currency formatting
-    for row in ws.iter_rows(min_row=5, max_row=ws.max_row, max_col=12):
-        for cell in row:
-            if isinstance(cell.value, (int, float)):
-                cell.number_format = '"$"#,##0.00'
-
-    # Set percentage formatting for specific cells
-    percentage_cells = ['B5', 'B6', 'B7']  # Tax Rate, Discount Rate, Perpetual Growth Rate
-    for cell_ref in percentage_cells:
-        cell = ws[cell_ref]
-        if isinstance(cell.value, (int, float)):
-            cell.number_format = '0.00%'
-
-    # Add borders to data
+    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
+    from openpyxl.worksheet.dimensions import ColumnDimension
+
+    # Set column widths with a single dimension spanning columns A:L
+    ws.column_dimensions["A"] = ColumnDimension(ws, index="A", min=1, max=12, width=15)
+
+    # Header style
+    header_style = NamedStyle(
+        name="header",
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid"),
+        border=Border(bottom=Side(border_style="thin")),
+        alignment=Alignment(horizontal="center"),
+    )
+
+    # Data styles with borders, currency formatting for numbers
     thin_border = Border(left=Side(border_style="thin"), right=Side(border_style="thin"),
                          top=Side(border_style="thin"), bottom=Side(border_style="thin"))
-    for row in ws.iter_rows(min_row=5, max_row=ws.max_row, max_col=12):
-        for cell in row:
-            cell.border = thin_border
+    currency_style = NamedStyle(name="currency", font=copy(DEFAULT_FONT), number_format='"$"#,##0.00',
+                                border=thin_border, alignment=Alignment(horizontal="right"))
+    data_style = NamedStyle(name="data", font=copy(DEFAULT_FONT), border=thin_border)
 
-# Function to add charts to the spreadsheet
-def add_charts(ws, dcf_results):
-    """
-    Add charts to the worksheet.
-    """
-    # Line chart for cash flows
-    chart = LineChart()
-    chart.title = "Unlevered Free Cash Flow (UFCF)"
-    chart.style = 13
-    chart.y_axis.title = "Cash Flow ($)"
-    chart.x_axis.title = "Year"
-    data = Reference(ws, min_col=6, min_row=13, max_col=10, max_row=13)
-    categories = Reference(ws, min_col=5, min_row=12, max_col=10, max_row=12)
-    chart.add_data(data, titles_from_data=True)
-    chart.set_categories(categories)
-    ws.add_chart(chart, "A30")
+    for style in (header_style, currency_style, data_style):
+        wb.add_named_style(style)
 
 # Function to generate Excel spreadsheet
+@st.cache_data(show_spinner=False)
 def generate_spreadsheet(user_inputs, dcf_results, company_name):
     """
     Generate an Excel spreadsheet with DCF results.
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "DCF Model"
-
-    # Write headers
-    ws.append([f"DCF Model for {company_name}"])
-    ws.append(["All figures in millions unless otherwise stated"])
-    ws.append([])
-    ws.append(["", "Hist.", "Proj.", "Proj.", "Proj.", "Proj.", "Proj."])
-    ws.append(["", "Period 0", "Period 1", "Period 2", "Period 3", "Period 4", "Period 5"])
-    ws.append([])
-    ws.append(["Discounted Cash Flow"])
-    ws.append(["", "Tax rate", user_inputs["tax_rate"]])
-    ws.append(["", "Long term growth rate", user_inputs["long_term_growth_rate"]])
-    ws.append(["", "WACC", user_inputs["wacc"]])
-    ws.append(["", "Share price", user_inputs["share_price"]])
-    ws.append(["", "Shares outstanding", user_inputs["shares_outstanding"]])
-    ws.append([])
-    ws.append(["", "Year count", "", 1, 2, 3, 4, 5])
-    ws.append(["", "EBIT", "", *user_inputs["ebit"]])
-    ws.append(["", "Tax on EBIT", "", *[ebit * user_inputs["tax_rate"] * -1 for ebit in user_inputs["ebit"]]])
-    ws.append(["", "+ Depreciation and amortization", "", *user_inputs["da"]])
-    ws.append(["", "- Capital expenditure", "", *user_inputs["capex"]])
-    ws.append(["", "Change in operating working capital", "", *user_inputs["changes_in_nwc"]])
-    ws.append(["", "Free cash flow", "", *dcf_results["fcf"]])
-    ws.append([])
-    ws.append(["", "Terminal value", "", "", "", "", "", dcf_results["terminal_value"]])
-    ws.append([])
-    ws.append(["", "Discount factor", "", *[1 / (1 + user_inputs["wacc"]) ** (i + 1) for i in range(5)]])
-    ws.append(["", "Present value of free cash flows", "", *dcf_results["present_values"]])
-    ws.append([])
-    ws.append(["", "Sum of present value of free cash flows", sum(dcf_results["present_values"])])
-    ws.append(["", "Present value of terminal value", dcf_results["present_terminal_value"]])
-    ws.append(["", "Enterprise value", dcf_results["enterprise_value"]])
-    ws.append([])
-    ws.append(["", "+ Cash", user_inputs["cash"]])
-    ws.append(["", "- Debt", user_inputs["debt"]])
-    ws.append(["", "Implied equity value (intrinsic value)", dcf_results["equity_value"]])
-    ws.append([])
-    ws.append(["", "Market capitalization", dcf_results["market_cap"]])
-    ws.append(["", "Intrinsic value premium to market capitalization", dcf_results["intrinsic_value_premium"]])
-    ws.append(["", "Intrinsic value premium percentage", dcf_results["intrinsic_value_premium_percentage"]])
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("DCF Model")
 
     # Apply professional formatting
-    apply_formatting(ws)
+    apply_formatting(wb, ws)
+
+    # Build the header and data rows up front
+    header_rows = [
+        [f"DCF Model for {company_name}"],
+        ["All figures in millions unless otherwise stated"],
+        [],
+        ["", "Hist.", "Proj.", "Proj.", "Proj.", "Proj.", "Proj."],
+    ]
+    data_rows = [
+        ["", "Period 0", "Period 1", "Period 2", "Period 3", "Period 4", "Period 5"],
+        [],
+        ["Discounted Cash Flow"],
+        ["", "Tax rate", user_inputs["tax_rate"]],
+        ["", "Long term growth rate", user_inputs["long_term_growth_rate"]],
+        ["", "WACC", user_inputs["wacc"]],
+        ["", "Share price", user_inputs["share_price"]],
+        ["", "Shares outstanding", user_inputs["shares_outstanding"]],
+        [],
+        ["", "Year count", "", 1, 2, 3, 4, 5],
+        ["", "EBIT", "", *user_inputs["ebit"]],
+        ["", "Tax on EBIT", "", *dcf_results.tax_on_ebit],
+        ["", "+ Depreciation and amortization", "", *user_inputs["da"]],
+        ["", "- Capital expenditure", "", *user_inputs["capex"]],
+        ["", "Change in operating working capital", "", *user_inputs["changes_in_nwc"]],
+        ["", "Free cash flow", "", *dcf_results.fcf],
+        [],
+        ["", "Terminal value", "", "", "", "", "", dcf_results.terminal_value],
+        [],
+        ["", "Discount factor", "", *dcf_results.discount_factors],
+        ["", "Present value of free cash flows", "", *dcf_results.present_values],
+        [],
+        ["", "Sum of present value of free cash flows", dcf_results.present_values.sum()],
+        ["", "Present value of terminal value", dcf_results.present_terminal_value],
+        ["", "Enterprise value", dcf_results.enterprise_value],
+        [],
+        ["", "+ Cash", user_inputs["cash"]],
+        ["", "- Debt", user_inputs["debt"]],
+        ["", "Implied equity value (intrinsic value)", dcf_results.equity_value],
+        [],
+        ["", "Market capitalization", dcf_results.market_cap],
+        ["", "Intrinsic value premium to market capitalization", dcf_results.intrinsic_value_premium],
+        ["", "Intrinsic value premium percentage", dcf_results.intrinsic_value_premium_percentage],
+    ]
 
-    # Save to BytesIO object
+    # Stream the rows out with their named styles, padded to the formatted width
+    for row_index, values in enumerate(header_rows + data_rows):
+        header = row_index < len(header_rows)
+        cells = [None] * 12
+        for col in range(12):
+            value = values[col] if col < len(values) else None
+            cell = WriteOnlyCell(ws, value=value)
+            if header:
+                cell.style = "header"
+            elif isinstance(value, (int, float)):
+                cell.style = "currency"
+            else:
+                cell.style = "data"
+            cells[col] = cell
+        ws.append(cells)
+
+    # Save to bytes so the result can be cached
     output = BytesIO()
     wb.save(output)
-    output.seek(0)
-    return output
+    return output.getvalue()
+
+# Bound format methods reused by the value formatters
+_CURRENCY_FORMAT = "${:,.2f}".format
+_PERCENTAGE_FORMAT = "{:.2%}".format
 
 def format_currency(value):
     """
     Format a number as currency with commas and 2 decimal places.
     """
-    return f"${value:,.2f}"
+    return _CURRENCY_FORMAT(value)
 
 def format_percentage(value):
     """
     Format a number as percentage with 2 decimal places.
     """
-    return f"{value:.2%}"
+    return _PERCENTAGE_FORMAT(value)
 
-def display_colored_value(label, value, color, is_percentage=False):
+# Function to draw a two-column table on a PDF canvas
+def draw_pdf_table(c, rows, top):
     """
-    Display a value with a colored label using Streamlit markdown.
-    
-    Args:
-        label (str): The label to display
-        value (float): The numerical value to display
-        color (str): The color to use ('red' or 'green')
-        is_percentage (bool): Whether to format as percentage
+    Draw a table with a grey header row and beige body rows, returning its bottom edge.
     """
-    formatted_value = format_percentage(value) if is_percentage else format_currency(value)
-    st.markdown(f"**{label}:** <span style='color: {color}'>{formatted_value}</span>", unsafe_allow_html=True)
-
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+
+    left = 1.75 * inch
+    widths = (3 * inch, 2 * inch)
+    right = left + sum(widths)
+    header_height, row_height = 30, 18
+
+    y = top
+    for row_index, (label, value) in enumerate(rows):
+        header = row_index == 0
+        height = header_height if header else row_height
+        y -= height
+
+        # Cell background
+        c.setFillColor(colors.grey if header else colors.beige)
+        c.rect(left, y, right - left, height, stroke=0, fill=1)
+
+        # Cell text, header centered and values right-aligned
+        c.setFillColor(colors.whitesmoke if header else colors.black)
+        c.setFont("Helvetica-Bold" if header else "Helvetica", 14 if header else 12)
+        baseline = y + (13 if header else 5)
+        c.drawCentredString(left + widths[0] / 2, baseline, label)
+        if header:
+            c.drawCentredString(left + widths[0] + widths[1] / 2, baseline, value)
+        else:
+            c.drawRightString(right - 6, baseline, value)
+
+    # Grid
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.grid([left, left + widths[0], right],
+           [top] + [top - header_height - i * row_height for i in range(len(rows))])
+    return y
+
+@st.cache_data(show_spinner=False)
 def generate_pdf(user_inputs, dcf_results, company_name):
     """
     Generate a PDF report with DCF results.
     """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30
-    )
-    elements.append(Paragraph(f"DCF Analysis Report for {company_name}", title_style))
-    elements.append(Spacer(1, 12))
+    c = canvas.Canvas(buffer, pagesize=letter)
+
+    # Title, wrapped to the page width between the 1 inch margins
+    title_leading = 29
+    title_lines = simpleSplit(f"DCF Analysis Report for {company_name}", "Helvetica-Bold", 24,
+                              letter[0] - 2 * inch)
+    c.setFont("Helvetica-Bold", 24)
+    for line_index, line in enumerate(title_lines):
+        c.drawString(1 * inch, 9.6 * inch - line_index * title_leading, line)
+    title_offset = (len(title_lines) - 1) * title_leading
 
     # Key Assumptions Table
     assumptions_data = [
@@ -245,67 +309,29 @@ def generate_pdf(user_inputs, dcf_results, company_name):
         ["Share Price", f"${user_inputs['share_price']:.2f}"],
         ["Shares Outstanding", f"{user_inputs['shares_outstanding']:,.0f}"],
     ]
-    
-    assumptions_table = Table(assumptions_data, colWidths=[3*inch, 2*inch])
-    assumptions_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-    ]))
-    elements.append(assumptions_table)
-    elements.append(Spacer(1, 20))
+    bottom = draw_pdf_table(c, assumptions_data, 9.05 * inch - title_offset)
 
     # Results Table
     results_data = [
         ["DCF Results", "Value"],
-        ["Enterprise Value", f"${dcf_results['enterprise_value']:,.2f}"],
-        ["Equity Value", f"${dcf_results['equity_value']:,.2f}"],
-        ["Intrinsic Value per Share", f"${dcf_results['intrinsic_value_per_share']:,.2f}"],
-        ["Market Cap", f"${dcf_results['market_cap']:,.2f}"],
-        ["Intrinsic Value Premium", f"${dcf_results['intrinsic_value_premium']:,.2f}"],
-        ["Premium Percentage", f"{dcf_results['intrinsic_value_premium_percentage']:.1%}"],
+        ["Enterprise Value", f"${dcf_results.enterprise_value:,.2f}"],
+        ["Equity Value", f"${dcf_results.equity_value:,.2f}"],
+        ["Intrinsic Value per Share", f"${dcf_results.intrinsic_value_per_share:,.2f}"],
+        ["Market Cap", f"${dcf_results.market_cap:,.2f}"],
+        ["Intrinsic Value Premium", f"${dcf_results.intrinsic_value_premium:,.2f}"],
+        ["Premium Percentage", f"{dcf_results.intrinsic_value_premium_percentage:.1%}"],
     ]
-    
-    results_table = Table(results_data, colWidths=[3*inch, 2*inch])
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-    ]))
-    elements.append(results_table)
-    
+    bottom = draw_pdf_table(c, results_data, bottom - 20)
+
     # Footer
-    elements.append(Spacer(1, 20))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey
-    )
-    elements.append(Paragraph("Disclaimer: This report is for educational purposes only.", footer_style))
-    
+    c.setFillColor(colors.grey)
+    c.setFont("Helvetica", 8)
+    c.drawString(1 * inch, bottom - 30, "Disclaimer: This report is for educational purposes only.")
+
     # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
 
 # Streamlit App
 def main():
@@ -336,37 +362,21 @@ def main():
 
     # Yearly Projections
     with st.expander("5-Year Projections", expanded=True):
-        # EBIT Projections
-        st.subheader("EBIT Projections")
-        ebit_cols = st.columns(5)
-        ebit = []
-        for i, col in enumerate(ebit_cols):
-            with col:
-                ebit.append(st.number_input(f"Year {i+1}", value=270.0 if i == 0 else 0.0, key=f"ebit_{i}"))
-
-        # D&A Projections
-        st.subheader("Depreciation & Amortization")
-        da_cols = st.columns(5)
-        da = []
-        for i, col in enumerate(da_cols):
-            with col:
-                da.append(st.number_input(f"Year {i+1}", value=20.0 if i == 0 else 0.0, key=f"da_{i}"))
-
-        # CapEx Projections
-        st.subheader("Capital Expenditure")
-        capex_cols = st.columns(5)
-        capex = []
-        for i, col in enumerate(capex_cols):
-            with col:
-                capex.append(st.number_input(f"Year {i+1}", value=-30.0 if i == 0 else 0.0, key=f"capex_{i}"))
-
-        # NWC Changes Projections
-        st.subheader("Changes in Net Working Capital")
-        nwc_cols = st.columns(5)
-        changes_in_nwc = []
-        for i, col in enumerate(nwc_cols):
-            with col:
-                changes_in_nwc.append(st.number_input(f"Year {i+1}", value=-2.8 if i == 0 else 0.0, key=f"nwc_{i}"))
+        # EBIT, D&A, CapEx and NWC changes edited together in a single grid
+        projections = pd.DataFrame(
+            {
+                "EBIT": [270.0, 0.0, 0.0, 0.0, 0.0],
+                "Depreciation & Amortization": [20.0, 0.0, 0.0, 0.0, 0.0],
+                "Capital Expenditure": [-30.0, 0.0, 0.0, 0.0, 0.0],
+                "Changes in NWC": [-2.8, 0.0, 0.0, 0.0, 0.0],
+            },
+            index=[f"Year {i+1}" for i in range(5)],
+        )
+        projections = st.data_editor(projections, num_rows="fixed", key="projections").fillna(0.0)
+        ebit = projections["EBIT"].tolist()
+        da = projections["Depreciation & Amortization"].tolist()
+        capex = projections["Capital Expenditure"].tolist()
+        changes_in_nwc = projections["Changes in NWC"].tolist()
 
     # Store user inputs in a dictionary
     user_inputs = {
@@ -383,57 +393,76 @@ def main():
         "changes_in_nwc": changes_in_nwc,
     }
 
-    # Calculate DCF
+    # Calculate DCF for a snapshot of the current inputs; the results and any
+    # prepared reports stay tied to that snapshot until Calculate is clicked again
     if st.button("Calculate DCF"):
-        try:
-            dcf_results = calculate_dcf(user_inputs)
-
-            # Display results in a more organized way
-            with st.expander("DCF Results", expanded=True):
-                st.subheader("DCF Results")
-                with st.container():
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        display_colored_value("Enterprise Value", dcf_results["enterprise_value"], "green")
-                        display_colored_value("Equity Value", dcf_results["equity_value"], "green")
-                    with col2:
-                        display_colored_value("Intrinsic Value per Share", dcf_results["intrinsic_value_per_share"], "green")
-                        display_colored_value("Market Cap", dcf_results["market_cap"], "blue")
-                    with col3:
-                        display_colored_value("Intrinsic Value Premium", dcf_results["intrinsic_value_premium"], 
-                                           "green" if dcf_results["intrinsic_value_premium"] >= 0 else "red")
-                        display_colored_value("Intrinsic Value Premium %", 
-                                           dcf_results["intrinsic_value_premium_percentage"], 
-                                           "green" if dcf_results["intrinsic_value_premium"] >= 0 else "red",
-                                           is_percentage=True)
-
-                # Download buttons in columns
-                st.subheader("Download Reports")
-                col1, col2 = st.columns(2)
-                
+        # Validate inputs up front so the calculation itself never divides by zero
+        if wacc <= -1:
+            error = "WACC must be greater than -100%."
+        elif wacc <= long_term_growth_rate:
+            error = "WACC must be greater than the long term growth rate."
+        elif shares_outstanding <= 0:
+            error = "Shares outstanding must be greater than zero."
+        elif share_price <= 0:
+            error = "Share price must be greater than zero."
+        else:
+            error = None
+
+        if error:
+            st.error(error)
+            st.session_state.pop("dcf_inputs", None)
+        else:
+            st.session_state["dcf_inputs"] = (user_inputs, company_name)
+
+    if "dcf_inputs" in st.session_state:
+        calculated = st.session_state["dcf_inputs"]
+        calculated_inputs, calculated_company_name = calculated
+        dcf_results = calculate_dcf(calculated_inputs)
+
+        # Display results in a more organized way
+        with st.expander("DCF Results", expanded=True):
+            st.subheader("DCF Results")
+            with st.container():
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    # Excel download
-                    excel_file = generate_spreadsheet(user_inputs, dcf_results, company_name)
+                    st.metric("Enterprise Value", format_currency(dcf_results.enterprise_value))
+                    st.metric("Equity Value", format_currency(dcf_results.equity_value))
+                with col2:
+                    st.metric("Intrinsic Value per Share", format_currency(dcf_results.intrinsic_value_per_share))
+                    st.metric("Market Cap", format_currency(dcf_results.market_cap))
+                with col3:
+                    st.metric("Intrinsic Value Premium", format_currency(dcf_results.intrinsic_value_premium),
+                              delta=format_percentage(dcf_results.intrinsic_value_premium_percentage),
+                              delta_color="normal")
+
+            # Download buttons in columns, each report is only generated once requested
+            st.subheader("Download Reports")
+            col1, col2 = st.columns(2)
+                
+            with col1:
+                # Excel download
+                if st.session_state.get("xlsx") == calculated or st.button("Prepare Excel File"):
+                    st.session_state["xlsx"] = calculated
+                    excel_file = generate_spreadsheet(calculated_inputs, dcf_results, calculated_company_name)
                     st.download_button(
                         label="Download Excel File",
                         data=excel_file,
-                        file_name=f"dcf_analysis_{company_name.replace(' ', '_')}.xlsx",
+                        file_name=f"dcf_analysis_{calculated_company_name.replace(' ', '_')}.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     )
                 
-                with col2:
-                    # PDF download
-                    pdf_file = generate_pdf(user_inputs, dcf_results, company_name)
+            with col2:
+                # PDF download
+                if st.session_state.get("pdf") == calculated or st.button("Prepare PDF Report"):
+                    st.session_state["pdf"] = calculated
+                    pdf_file = generate_pdf(calculated_inputs, dcf_results, calculated_company_name)
                     st.download_button(
                         label="Download PDF Report",
                         data=pdf_file,
-                        file_name=f"dcf_analysis_{company_name.replace(' ', '_')}.pdf",
+                        file_name=f"dcf_analysis_{calculated_company_name.replace(' ', '_')}.pdf",
                         mime="application/pdf",
                     )
 
-        except Exception as e:
-            st.error(f"Error calculating DCF: {e}")
-
     # Footer
     st.markdown("---")
     st.markdown("**App Version:** 1.0 | **Disclaimer:** This app is for educational purposes only.")